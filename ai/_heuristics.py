@@ -0,0 +1,73 @@
+"""
+Board evaluation heuristics for the AI spawner, compiled with numba.
+
+Every kernel has an explicit signature so it compiles (or loads from the
+on-disk cache) at import, instead of stalling the first spawn.
+"""
+import numpy as np
+from numba import njit
+
+# how much the current game score counts for in the evaluation
+SCORE_WEIGHT = 2.0
+
+
+@njit("uint8[:, ::1](uint64)", cache=True)
+def unpack_exponents(bits):
+    """Unpack a bitboard into a 4x4 array of tile exponents."""
+    grid = np.empty((4, 4), np.uint8)
+    for i in range(16):
+        grid[i // 4, i % 4] = (bits >> np.uint64(4 * i)) & np.uint64(0xF)
+    return grid
+
+
+# snake-shaped weights: the biggest tile wants a corner and the rest
+# should trail off from it in a zig-zag along the rows
+SNAKE_WEIGHTS = np.array([
+    [65536, 32768, 16384, 8192],
+    [512, 1024, 2048, 4096],
+    [256, 128, 64, 32],
+    [2, 4, 8, 16]
+], dtype=np.float64)
+
+# every corner is as good as any other, so score all 8 rotations and
+# mirror images of the snake and keep the best one
+_SNAKES = np.array(
+    [np.rot90(SNAKE_WEIGHTS, k) for k in range(4)] +
+    [np.rot90(SNAKE_WEIGHTS.T, k) for k in range(4)]
+)
+
+
+@njit("float64(uint8[:, ::1])", cache=True, fastmath=True)
+def snake_score(grid):
+    """Dot product of the tile values with the best-fitting snake."""
+    best = 0.0
+    for snake in _SNAKES:
+        total = 0.0
+        for i in range(4):
+            for j in range(4):
+                if grid[i, j] != 0:
+                    total += snake[i, j] * (1 << np.int64(grid[i, j]))
+        best = max(best, total)
+    return best
+
+
+@njit("float64(uint64)", cache=True, fastmath=True)
+def evaluate_position(bits):
+    """
+    Heuristic value of where the tiles are on a packed board, leaving
+    out the game score.
+    """
+    grid = unpack_exponents(bits)
+
+    # having empty spaces is super important
+    empty_tiles = 0
+    for i in range(4):
+        for j in range(4):
+            if grid[i, j] == 0:
+                empty_tiles += 1
+    value = empty_tiles * 500.0
+
+    # big tiles should sit in a corner with the rest lined up behind them
+    value += snake_score(grid)
+
+    return value
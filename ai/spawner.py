@@ -1,6 +1,30 @@
 """AI spawner module for 2048."""
-import copy
+import time
+from functools import lru_cache
 import numpy as np
+#pylint: disable=E0401
+from ai._heuristics import SCORE_WEIGHT, evaluate_position
+
+# wipe the transposition table once it gets this big
+TT_MAX_ENTRIES = 1 << 20
+
+
+@lru_cache(maxsize=1 << 18)
+def _position_value(bits):
+    """
+    Heuristic value of a packed board's tile layout.
+
+    The same positions come up over and over at the leaves (every child
+    gets scored for move ordering and again when it's searched), and
+    the value only depends on the tiles, so it's cached by the packed
+    board across every search.
+    """
+    return evaluate_position(bits)
+
+
+class _SearchTimeout(Exception):
+    """Raised inside the search when the time budget runs out."""
+
 #pylint: disable=R0903
 class AISpawner:
     """
@@ -8,7 +32,7 @@ class AISpawner:
     Easy = helps player, Hard = hinders player, Medium = random
     """
 
-    def __init__(self, difficulty='medium', search_depth=2, debug=False):
+    def __init__(self, difficulty='medium', search_depth=2, debug=False, time_limit=0.05):
         """
         Initialize AI spawner.
 
@@ -16,6 +40,8 @@ class AISpawner:
             difficulty: 'easy', 'medium', or 'hard'
             search_depth: How many moves ahead to look 2-3
             debug: If True, print AI decisions to console
+            time_limit: Seconds to spend on one spawn before settling
+                for the deepest search that finished
         """
         self.difficulty = difficulty.lower()
         # on hard mode look one step further ahead to be extra mean
@@ -24,6 +50,16 @@ class AISpawner:
         else:
             self.search_depth = search_depth
         self.debug = debug
+        self.time_limit = time_limit
+        self._deadline = None
+
+        # transposition table: (packed board, turn) -> (value, depth)
+        # values are stored without the score term since that depends on
+        # how we got here, not on the position itself
+        self._tt = {}
+
+        # one generator for everything instead of the global numpy state
+        self._rng = np.random.default_rng()
 
     def spawn_tile(self, board):
         """
@@ -39,57 +75,88 @@ class AISpawner:
             # classic mode - just pick a random spot
             return self._spawn_random(board)
 
-        empty_cells = list(zip(*np.where(board.grid == 0)))
+        empty_cells = board.empty_cells()
         if not empty_cells:
             return False
 
         # figure out how good each position would be for the player
-        scores = []
-        for row, col in empty_cells:
-            # check both possible tile values
-            score_2 = self._evaluate_spawn(board, row, col, 2)
-            score_4 = self._evaluate_spawn(board, row, col, 4)
-
-            # weight them by probability (90% chance of 2, 10% chance of 4)
-            avg_score = 0.9 * score_2 + 0.1 * score_4
-            scores.append((avg_score, row, col))
+        scores = self._score_spawns(board, empty_cells)
 
-        # sort from worst to best
-        scores.sort(key=lambda x: x[0])
-
-        # pick based on difficulty
+        # pick based on difficulty - only the extreme matters, no need to sort
         if self.difficulty == 'easy':
-            best_pos = scores[-1]  # give them the best spot
+            idx = int(scores.argmax())  # give them the best spot
         else:  # hard
-            best_pos = scores[0]  # give them the worst spot
+            idx = int(scores.argmin())  # give them the worst spot
 
-        _, row, col = best_pos
+        row, col = empty_cells[idx]
 
         # spawn the tile with normal probabilities
-        board._grid[row, col] = np.random.choice([2, 4], p=[0.9, 0.1])  # pylint: disable=protected-access
+        board.set_tile(row, col, self._random_tile_value())
 
         # debug helper
         if self.debug:
             print(f"\n AI {self.difficulty.upper()} spawned at ({row},{col})")
-            print(f"   Position score: {best_pos[0]:.1f}")
-            print(f"   All scores: {sorted([s[0] for s in scores])}")
-            print(f"   Best score: {max(s[0] for s in scores):.1f}")
-            print(f"   Worst score: {min(s[0] for s in scores):.1f}")
+            print(f"   Position score: {scores[idx]:.1f}")
+            print(f"   All scores: {np.sort(scores).tolist()}")
+            print(f"   Best score: {scores.max():.1f}")
+            print(f"   Worst score: {scores.min():.1f}")
 
         return True
 
     def _spawn_random(self, board):
         """Original random spawning for medium difficulty."""
-        empty_cells = list(zip(*np.where(board.grid == 0)))
+        empty_cells = board.empty_cells()
         if not empty_cells:
             return False
 
-        index = int(np.random.randint(len(empty_cells)))
+        index = int(self._rng.integers(len(empty_cells)))
         row, col = empty_cells[index]
-        board._grid[row, col] = np.random.choice([2, 4], p=[0.9, 0.1])  # pylint: disable=protected-access
+        board.set_tile(row, col, self._random_tile_value())
         return True
 
-    def _evaluate_spawn(self, board, row, col, value):
+    def _score_spawns(self, board, empty_cells):
+        """
+        Score every empty cell with iterative deepening.
+
+        Searches depth 1, 2, ... up to search_depth and keeps the deepest
+        pass that finished inside the time limit. Shallow passes are cheap
+        and leave their results in the transposition table for deeper ones.
+
+        Args:
+            board: Board instance
+            empty_cells: (row, col) of every empty cell
+
+        Returns:
+            np.ndarray: Average score of each cell, in the same order
+        """
+        deadline = time.perf_counter() + self.time_limit
+        scores = None
+
+        for depth in range(1, self.search_depth + 1):
+            # the first pass always finishes so we have something to go on
+            self._deadline = None if scores is None else deadline
+            try:
+                depth_scores = np.empty(len(empty_cells))
+                for i, (row, col) in enumerate(empty_cells):
+                    # check both possible tile values
+                    score_2 = self._evaluate_spawn(board, row, col, 2, depth)
+                    score_4 = self._evaluate_spawn(board, row, col, 4, depth)
+
+                    # weight them by probability (90% chance of 2, 10% chance of 4)
+                    depth_scores[i] = 0.9 * score_2 + 0.1 * score_4
+            except _SearchTimeout:
+                break
+            finally:
+                self._deadline = None
+            scores = depth_scores
+
+        return scores
+
+    def _random_tile_value(self):
+        """Pick a new tile value with the normal odds (90% a 2, 10% a 4)."""
+        return 2 if self._rng.random() < 0.9 else 4
+
+    def _evaluate_spawn(self, board, row, col, value, depth=None):
         """
         Evaluate how good a spawn position is for the player.
         Uses expectimax to look ahead.
@@ -98,16 +165,20 @@ class AISpawner:
             board: Board instance
             row, col: Position to spawn
             value: Tile value (2 or 4)
+            depth: How far to search (defaults to search_depth)
 
         Returns:
             float: Expected score - higher = better for player
         """
-        # make a copy so we don't mess up the real board
-        temp_board = copy.deepcopy(board)
-        temp_board._grid[row, col] = value  # pylint: disable=protected-access
+        # make one scratch copy - the search plays and undoes moves on it
+        # so we don't mess up the real board
+        temp_board = board.clone()
+        temp_board.set_tile(row, col, value)
 
         # simulate what might happen from here
-        return self._expectimax(temp_board, self.search_depth, True)
+        if depth is None:
+            depth = self.search_depth
+        return self._expectimax(temp_board, depth, True)
 
     def _expectimax(self, board, depth, is_player_turn):
         """
@@ -121,36 +192,60 @@ class AISpawner:
         Returns:
             float: Expected value of this state
         """
-        if depth == 0 or self._is_terminal(board):
-            return self._evaluate_board(board)
+        # lots of move orders reach the same position, so reuse old results
+        key = board.bits << 1 | is_player_turn
+        entry = self._tt.get(key)
+        if entry is not None and entry[1] >= depth:
+            return entry[0] + board.score * SCORE_WEIGHT
+
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise _SearchTimeout
 
-        if is_player_turn:
+        if depth == 0 or self._is_terminal(board):
+            value = self._evaluate_board(board)
+        elif is_player_turn:
             # player picks the best move they can
-            return self._max_node(board, depth)
-        # chance node - random tile appears
-        return self._chance_node(board, depth)
+            value = self._max_node(board, depth)
+        else:
+            # chance node - random tile appears
+            value = self._chance_node(board, depth)
 
-    def _max_node(self, board, depth):
-        """Player's turn - try all moves and pick best."""
-        max_value = float('-inf')
+        if len(self._tt) >= TT_MAX_ENTRIES:
+            self._tt.clear()
+        self._tt[key] = (value - board.score * SCORE_WEIGHT, depth)
 
-        for direction in ['up', 'down', 'left', 'right']:
-            temp_board = copy.deepcopy(board)
+        return value
 
-            if temp_board.move(direction):
-                # this move worked, see how good the result is
-                value = self._expectimax(temp_board, depth - 1, False)
-                max_value = max(max_value, value)
+    def _max_node(self, board, depth):
+        """Player's turn - try all moves and pick best."""
+        children = []
+        for move in range(4):
+            prev_bits, prev_score, changed = board.move_undoable(move)
+            if changed:
+                children.append((self._evaluate_board(board), move))
+                board.undo(prev_bits, prev_score)
 
         # if no moves worked, just evaluate where we are now
-        if max_value == float('-inf'):
+        if not children:
             return self._evaluate_board(board)
 
+        # search the most promising moves first so their subtrees are
+        # already in the transposition table when the others get there
+        children.sort(key=lambda child: child[0], reverse=True)
+
+        max_value = float('-inf')
+        for _, move in children:
+            # see how good the result of this move is
+            prev_bits, prev_score, _ = board.move_undoable(move)
+            value = self._expectimax(board, depth - 1, False)
+            board.undo(prev_bits, prev_score)
+            max_value = max(max_value, value)
+
         return max_value
 
     def _chance_node(self, board, depth):
         """Chance node - average over possible spawns."""
-        empty_cells = list(zip(*np.where(board.grid == 0)))
+        empty_cells = board.empty_cells()
 
         if not empty_cells:
             return self._evaluate_board(board)
@@ -161,19 +256,20 @@ class AISpawner:
         # if there are too many empty cells, just sample a few (optimization)
         if num_cells > 6:
             empty_cells = [empty_cells[i] for i in
-                          np.random.choice(num_cells, 6, replace=False)]
+                          self._rng.choice(num_cells, 6, replace=False)]
             num_cells = 6
 
         for row, col in empty_cells:
             # try spawning a 2
-            temp_board_2 = copy.deepcopy(board)
-            temp_board_2._grid[row, col] = 2  # pylint: disable=protected-access
-            value_2 = self._expectimax(temp_board_2, depth - 1, True)
+            board.set_tile(row, col, 2)
+            value_2 = self._expectimax(board, depth - 1, True)
 
             # try spawning a 4
-            temp_board_4 = copy.deepcopy(board)
-            temp_board_4._grid[row, col] = 4  # pylint: disable=protected-access
-            value_4 = self._expectimax(temp_board_4, depth - 1, True)
+            board.set_tile(row, col, 4)
+            value_4 = self._expectimax(board, depth - 1, True)
+
+            # put the cell back the way we found it
+            board.set_tile(row, col, 0)
 
             # combine them by probability
             cell_value = 0.9 * value_2 + 0.1 * value_4
@@ -183,129 +279,13 @@ class AISpawner:
 
     def _is_terminal(self, board):
         """Check if state is terminal (game over)."""
-        # if there's any empty space, game's not over
-        if np.any(board.grid == 0):
-            return False
-
-        # try all moves to see if any work
-        for direction in ['up', 'down', 'left', 'right']:
-            temp_board = copy.deepcopy(board)
-            if temp_board.move(direction):
-                return False
-
-        return True
+        # no empty cell and no equal neighbours means no move can work
+        return not board.can_move()
 
     def _evaluate_board(self, board):
         """
         Heuristic evaluation of board state.
         Higher score = better for player.
         """
-        grid = board.grid
-        score = 0
-
-        # current score matters a lot
-        score += board.score * 2.0
-
-        # having empty spaces is super important
-        empty_tiles = np.sum(grid == 0)
-        score += empty_tiles * 500
-
-        # tiles should flow in one direction (monotonicity)
-        score += self._monotonicity(grid) * 100
-
-        # similar tiles should be next to each other (smoothness)
-        score += self._smoothness(grid) * 30
-
-        # big bonus if the highest tile is in a corner
-        max_tile_bonus = self._max_tile_corner_bonus(grid) * 1000
-        score += max_tile_bonus
-
-        # big penalty if the max tile isn't in a corner
-        max_val = np.max(grid)
-        corners = [grid[0, 0], grid[0, -1], grid[-1, 0], grid[-1, -1]]
-        if max_val not in corners:
-            score -= 2000
-
-        # penalize scattered high tiles
-        high_tiles = grid[grid >= 64]
-        if len(high_tiles) > 0:
-            positions = np.argwhere(grid >= 64)
-            if len(positions) > 1:
-                spread = np.std(positions)
-                score -= spread * 50
-
-        # bonus for organized rows and columns
-        for i in range(grid.shape[0]):
-            row = grid[i, :]
-            if self._is_organized(row):
-                score += 200
-
-        for j in range(grid.shape[1]):
-            col = grid[:, j]
-            if self._is_organized(col):
-                score += 200
-
-        return score
-
-    def _monotonicity(self, grid):
-        """Measure how monotonic the rows or columns are."""
-        totals = [0, 0, 0, 0]  # up, down, left, right
-
-        # check each row
-        for i in range(grid.shape[0]):
-            for j in range(grid.shape[1] - 1):
-                if grid[i, j] > grid[i, j+1]:
-                    totals[0] += grid[i, j] - grid[i, j+1]
-                else:
-                    totals[1] += grid[i, j+1] - grid[i, j]
-
-        # check each column
-        for j in range(grid.shape[1]):
-            for i in range(grid.shape[0] - 1):
-                if grid[i, j] > grid[i+1, j]:
-                    totals[2] += grid[i, j] - grid[i+1, j]
-                else:
-                    totals[3] += grid[i+1, j] - grid[i, j]
-
-        return max(totals[0], totals[1]) + max(totals[2], totals[3])
-
-    def _smoothness(self, grid):
-        """Measure how smooth the grid is - lower differences between adjacent tiles."""
-        smoothness = 0
-
-        for i in range(grid.shape[0]):
-            for j in range(grid.shape[1]):
-                if grid[i, j] != 0:
-                    # check the tile to the right
-                    if j < grid.shape[1] - 1 and grid[i, j+1] != 0:
-                        smoothness -= abs(np.log2(grid[i, j]) - np.log2(grid[i, j+1]))
-                    # check the tile below
-                    if i < grid.shape[0] - 1 and grid[i+1, j] != 0:
-                        smoothness -= abs(np.log2(grid[i, j]) - np.log2(grid[i+1, j]))
-
-        return smoothness
-
-    def _max_tile_corner_bonus(self, grid):
-        """Give bonus if max tile is in a corner."""
-        max_val = np.max(grid)
-        corners = [grid[0, 0], grid[0, -1], grid[-1, 0], grid[-1, -1]]
-
-        if max_val in corners:
-            return 1
-        return 0
-
-    def _is_organized(self, line):
-        """Check if a line is organized - monotonic or mostly monotonic."""
-        non_zero = line[line != 0]
-        if len(non_zero) <= 1:
-            return True
-
-        # see if tiles are mostly increasing or decreasing
-        diffs = np.diff(non_zero)
-        increasing = np.sum(diffs > 0)
-        decreasing = np.sum(diffs < 0)
-
-        # at least 70% should follow one direction
-        total_changes = len(diffs)
-        threshold = 0.7 * total_changes
-        return (increasing >= threshold) or (decreasing >= threshold)
+        # the heavy lifting lives in compiled code, see ai/_heuristics.py
+        return _position_value(board.bits) + board.score * SCORE_WEIGHT
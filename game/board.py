@@ -1,10 +1,244 @@
 """Game board logic for 2048."""
-import copy
 import numpy as np
 #pylint: disable=E0401
-from game.utils import combine_line
 from ai.spawner import AISpawner
 
+# ================== BITBOARD ===================
+# The whole 4x4 grid is packed into a single 64-bit int. Each cell is a
+# 4-bit nibble holding the tile's exponent (empty = 0, 2 = 1, 4 = 2, ...,
+# 2048 = 11). Cell (row, col) lives at bit 4 * (4 * row + col), so row r
+# is the 16-bit chunk starting at bit 16 * r.
+ROW_MASK = 0xFFFF
+MAX_EXPONENT = 0xF
+
+
+def _slide_row_left(exponents):
+    """
+    Slide and merge one row of exponents to the left.
+
+    Args:
+        exponents: List of 4 tile exponents
+
+    Returns:
+        tuple: (new_exponents, score_gained)
+    """
+    tiles = [e for e in exponents if e]
+    new_row = []
+    score_gained = 0
+    i = 0
+
+    while i < len(tiles):
+        # a nibble can't hold anything past 2^15, so those never merge
+        if i + 1 < len(tiles) and tiles[i] == tiles[i + 1] < MAX_EXPONENT:
+            new_row.append(tiles[i] + 1)
+            score_gained += 1 << (tiles[i] + 1)
+            i += 2
+        else:
+            new_row.append(tiles[i])
+            i += 1
+
+    return new_row + [0] * (4 - len(new_row)), score_gained
+
+
+def _pack_row(exponents):
+    """Pack 4 exponents into a 16-bit row."""
+    return (exponents[0] | exponents[1] << 4 |
+            exponents[2] << 8 | exponents[3] << 12)
+
+
+def _build_row_tables():
+    """
+    Precompute the result of sliding every possible 16-bit row.
+
+    Returns:
+        tuple: (left_table, right_table, score_table) indexed by row
+    """
+    left_table = [0] * 65536
+    right_table = [0] * 65536
+    score_table = [0] * 65536
+
+    for row in range(65536):
+        exponents = [(row >> shift) & 0xF for shift in (0, 4, 8, 12)]
+        new_row, score_gained = _slide_row_left(exponents)
+
+        left_table[row] = _pack_row(new_row)
+        # sliding right is just sliding the mirrored row left
+        right_table[_pack_row(exponents[::-1])] = _pack_row(new_row[::-1])
+        # a run of equal tiles merges the same pairs either way
+        score_table[row] = score_gained
+
+    return left_table, right_table, score_table
+
+
+ROW_LEFT_TABLE, ROW_RIGHT_TABLE, ROW_SCORE_TABLE = _build_row_tables()
+
+# ROW_EMPTY_MASK[row] has bit c set when column c of that row is empty,
+# and _EMPTY_CELLS[r][mask] lists the matching (row, col) positions
+ROW_EMPTY_MASK = [
+    sum(1 << c for c in range(4) if not (row >> (4 * c)) & 0xF)
+    for row in range(65536)
+]
+_EMPTY_CELLS = [
+    [tuple((r, c) for c in range(4) if mask >> c & 1) for mask in range(16)]
+    for r in range(4)
+]
+
+
+def empty_cells(bits):
+    """
+    Find the empty cells of a bitboard.
+
+    Returns:
+        tuple: (row, col) of every empty cell, in reading order
+    """
+    return (_EMPTY_CELLS[0][ROW_EMPTY_MASK[bits & ROW_MASK]] +
+            _EMPTY_CELLS[1][ROW_EMPTY_MASK[(bits >> 16) & ROW_MASK]] +
+            _EMPTY_CELLS[2][ROW_EMPTY_MASK[(bits >> 32) & ROW_MASK]] +
+            _EMPTY_CELLS[3][ROW_EMPTY_MASK[bits >> 48]])
+
+
+def transpose(bits):
+    """Swap rows and columns of a bitboard."""
+    a1 = bits & 0xF0F00F0FF0F00F0F
+    a2 = bits & 0x0000F0F00000F0F0
+    a3 = bits & 0x0F0F00000F0F0000
+    a = a1 | (a2 << 12) | (a3 >> 12)
+    b1 = a & 0xFF00FF0000FF00FF
+    b2 = a & 0x00FF00FF00000000
+    b3 = a & 0x00000000FF00FF00
+    return b1 | (b2 >> 24) | (b3 << 24)
+
+
+def _shift_rows(bits, table):
+    """Run every row of a bitboard through one of the row tables."""
+    new_bits = 0
+    score_gained = 0
+    for shift in (0, 16, 32, 48):
+        row = (bits >> shift) & ROW_MASK
+        new_bits |= table[row] << shift
+        score_gained += ROW_SCORE_TABLE[row]
+    return new_bits, score_gained
+
+
+# moves are plain ints so the hot paths can index instead of compare strings
+MOVE_UP, MOVE_DOWN, MOVE_LEFT, MOVE_RIGHT = 0, 1, 2, 3
+DIRECTIONS = {'up': MOVE_UP, 'down': MOVE_DOWN, 'left': MOVE_LEFT, 'right': MOVE_RIGHT}
+
+
+def _move_up(bits):
+    """Slide a bitboard up (columns are just rows of the transposed board)."""
+    new_bits, score_gained = _shift_rows(transpose(bits), ROW_LEFT_TABLE)
+    return transpose(new_bits), score_gained
+
+
+def _move_down(bits):
+    """Slide a bitboard down."""
+    new_bits, score_gained = _shift_rows(transpose(bits), ROW_RIGHT_TABLE)
+    return transpose(new_bits), score_gained
+
+
+def _move_left(bits):
+    """Slide a bitboard left."""
+    return _shift_rows(bits, ROW_LEFT_TABLE)
+
+
+def _move_right(bits):
+    """Slide a bitboard right."""
+    return _shift_rows(bits, ROW_RIGHT_TABLE)
+
+
+_MOVE_FNS = (_move_up, _move_down, _move_left, _move_right)
+
+
+def shift_bits(bits, move):
+    """
+    Slide a bitboard in a direction.
+
+    Args:
+        bits: Packed board
+        move: One of MOVE_UP, MOVE_DOWN, MOVE_LEFT, MOVE_RIGHT
+
+    Returns:
+        tuple: (new_bits, score_gained)
+    """
+    return _MOVE_FNS[move](bits)
+
+
+# tiles are exact powers of two, so log2 is just a table lookup
+_LOG2 = np.zeros(1 << (MAX_EXPONENT + 1), dtype=np.uint64)
+_LOG2[[1 << k for k in range(1, MAX_EXPONENT + 1)]] = np.arange(1, MAX_EXPONENT + 1)
+_CELL_SHIFTS = np.arange(0, 64, 4, dtype=np.uint64)
+
+
+# the low bit of every nibble, and the same for nibbles that have a
+# neighbour to the right / below them
+_NIBBLE_LOW_BITS = 0x1111111111111111
+_HAS_RIGHT_NEIGHBOUR = 0x0111011101110111
+_HAS_LOWER_NEIGHBOUR = 0x0000111111111111
+
+
+def _nonzero_nibbles(bits):
+    """Set the low bit of every nibble that isn't zero."""
+    return (bits | bits >> 1 | bits >> 2 | bits >> 3) & _NIBBLE_LOW_BITS
+
+
+def can_move(bits):
+    """
+    Check if any move is possible on a bitboard.
+
+    A move exists if there's an empty cell or two equal tiles side by side.
+    """
+    if _nonzero_nibbles(bits) != _NIBBLE_LOW_BITS:
+        return True
+
+    # XOR-ing with the neighbour leaves a zero nibble wherever they match
+    if ~_nonzero_nibbles(bits ^ (bits >> 4)) & _HAS_RIGHT_NEIGHBOUR:
+        return True
+    return bool(~_nonzero_nibbles(bits ^ (bits >> 16)) & _HAS_LOWER_NEIGHBOUR)
+
+
+def pack_grid(grid):
+    """Pack a 4x4 array of tile values into a bitboard."""
+    exponents = _LOG2[np.asarray(grid).ravel()]
+    return int(np.bitwise_or.reduce(exponents << _CELL_SHIFTS))
+
+
+def unpack_grid(bits):
+    """Unpack a bitboard into a 4x4 array of tile values."""
+    grid = np.zeros(16, dtype=int)
+    for i in range(16):
+        exponent = (bits >> (4 * i)) & 0xF
+        if exponent:
+            grid[i] = 1 << exponent
+    return grid.reshape(4, 4)
+
+
+def max_exponent(bits):
+    """Get the largest exponent on a bitboard."""
+    best = 0
+    while bits:
+        best = max(best, bits & 0xF)
+        bits >>= 4
+    return best
+
+
+# ================== HIGH SCORE ===================
+HIGHSCORE_PATH = r"./game/highscore.txt"
+
+
+def _load_highscore():
+    """Read the saved high score, or 0 if there isn't a usable one."""
+    try:
+        with open(HIGHSCORE_PATH, "r", encoding="utf-8") as f:
+            return int(f.read() or 0)
+    except (OSError, ValueError):
+        return 0
+
+
+# read once at import so making a Board never touches the disk
+_HIGHSCORE = _load_highscore()
+
+
 class Board:
     """Manages the game board state and logic."""
     # pylint: disable=R0902
@@ -13,18 +247,23 @@ class Board:
         Initialize game board.
 
         Args:
-            size: Board size (usually 4)
+            size: Board size (must be 4, the grid is packed into 64 bits)
             difficulty: 'easy', 'medium', or 'hard'
             ai_depth: Search depth for AI (2-3 recommended)
             spawn_initial: Whether to spawn initial tiles (set False for menu before spawning)
         """
+        if size != 4:
+            raise ValueError("Board only supports a 4x4 grid")
+
         self.size = size
-        self._grid = np.zeros((size, size), dtype=int)
+        self._bits = 0
+        self._grid_cache = None
+        self._grid_cache_bits = None
         self._score = 0
         self._high_tile = 0
         self._game_over = False
         self._won = False
-        self._highscore = 0
+        self._highscore = _HIGHSCORE
         self.difficulty = difficulty
 
         # set up the AI that decides where to spawn new tiles
@@ -35,17 +274,30 @@ class Board:
             self.spawn_random_tile()
             self.spawn_random_tile()
 
-        # load the saved high score from file
-        with open(r"./game/highscore.txt", "r", encoding="utf-8") as f:
-            highscore = f.read()
-            if highscore:
-                self._highscore = int(highscore)
-
     # properties so we can't accidentally access the privates
     @property
     def grid(self):
-        """Get the current game grid."""
-        return self._grid
+        """Get the current game grid (read-only, unpacked on demand)."""
+        if self._grid_cache_bits != self._bits:
+            self._grid_cache = unpack_grid(self._bits)
+            self._grid_cache.flags.writeable = False
+            self._grid_cache_bits = self._bits
+        return self._grid_cache
+
+    @property
+    def _grid(self):
+        """Get the grid - kept so a whole array can still be assigned."""
+        return self.grid
+
+    @_grid.setter
+    def _grid(self, grid):
+        """Replace the whole grid from an array of tile values."""
+        self._bits = pack_grid(grid)
+
+    @property
+    def bits(self):
+        """Get the packed bitboard."""
+        return self._bits
 
     @property
     def score(self):
@@ -67,6 +319,55 @@ class Board:
         """Check if the player has won."""
         return self._won
 
+    def clone(self):
+        """
+        Make a cheap copy of the board for the AI to play around with.
+
+        Only the grid gets copied - the spawner is shared since the AI
+        never changes it while searching.
+
+        Returns:
+            Board: New board with the same state
+        """
+        # pylint: disable=protected-access
+        clone = Board.__new__(Board)
+        clone._bits = self._bits
+        clone._grid_cache = self._grid_cache
+        clone._grid_cache_bits = self._grid_cache_bits
+        clone._score = self._score
+        clone._high_tile = self._high_tile
+        clone._game_over = self._game_over
+        clone._won = self._won
+        clone._highscore = self._highscore
+        clone.size = self.size
+        clone.difficulty = self.difficulty
+        clone.ai_spawner = self.ai_spawner
+        return clone
+
+    def __deepcopy__(self, memo):
+        """Route copy.deepcopy through clone() so it stays fast."""
+        return self.clone()
+
+    def empty_cells(self):
+        """Get the (row, col) of every empty cell."""
+        return empty_cells(self._bits)
+
+    def can_move(self):
+        """Check if any move is possible without trying them all."""
+        return can_move(self._bits)
+
+    def set_tile(self, row, col, value):
+        """
+        Put a tile on the board.
+
+        Args:
+            row, col: Position of the tile
+            value: Tile value (0 clears the cell)
+        """
+        shift = 4 * (int(row) * 4 + int(col))
+        exponent = int(value).bit_length() - 1 if value else 0
+        self._bits = (self._bits & ~(0xF << shift)) | (exponent << shift)
+
     def set_difficulty(self, difficulty):
         """Change difficulty mid-game."""
         self.difficulty = difficulty
@@ -78,7 +379,7 @@ class Board:
 
     def print_board(self):
         """Print the current board state to console."""
-        print(self._grid)
+        print(self.grid)
         print(f"Score: {self._score}")
         print(f"Difficulty: {self.difficulty}")
 
@@ -97,49 +398,33 @@ class Board:
         Returns:
             bool: True if move was successful, False if impossible
         """
-        if direction not in ['up', 'down', 'left', 'right']:
+        move = DIRECTIONS.get(direction)
+        if move is None:
             print("Invalid move direction!")
             return False
 
-        total_score_gained = 0
-        original_grid = self._grid.copy()
-
-        # for vertical moves, we flip the grid so we can treat everything as rows
-        if direction in ['up', 'down']:
-            grid_to_process = self._grid.T
-        else:
-            grid_to_process = self._grid
-
-        new_grid = np.zeros_like(grid_to_process, dtype=int)
-
-        for i in range(self.size):
-            line_to_process = grid_to_process[i, :]
-
-            # flip the line for moves going right or down
-            if direction in ['right', 'down']:
-                line_to_process = line_to_process[::-1]
-
-            new_line, score_gained = combine_line(line_to_process)
-            total_score_gained += score_gained
+        return self.move_idx(move)
 
-            # flip it back
-            if direction in ['right', 'down']:
-                new_line = new_line[::-1]
+    def move_idx(self, move):
+        """
+        Execute a move given as one of the MOVE_* constants.
 
-            new_grid[i, :] = new_line
+        Args:
+            move: MOVE_UP, MOVE_DOWN, MOVE_LEFT or MOVE_RIGHT
 
-        # flip the whole grid back if we moved vertically
-        if direction in ['up', 'down']:
-            new_grid = new_grid.T
+        Returns:
+            bool: True if move was successful, False if impossible
+        """
+        new_bits, score_gained = _MOVE_FNS[move](self._bits)
 
         # do nothing if the grid didn't change
-        if np.array_equal(new_grid, original_grid):
+        if new_bits == self._bits:
             return False
 
-        self._grid = new_grid
-        self._score += total_score_gained
+        self._bits = new_bits
+        self._score += score_gained
         self._highscore = max(self._score,self._highscore)
-        self._high_tile = self._grid.max()
+        self._high_tile = 1 << max_exponent(self._bits)
 
         # check if they just hit 2048 for the first time
         if self._high_tile >= 2048 and not self._won:
@@ -148,9 +433,40 @@ class Board:
 
         return True
 
+    def move_undoable(self, move):
+        """
+        Slide the tiles for the AI search so the move can be taken back.
+
+        Only the tiles and score change - the high tile, win flag and
+        high score are left alone since the search never needs them.
+
+        Args:
+            move: MOVE_UP, MOVE_DOWN, MOVE_LEFT or MOVE_RIGHT
+
+        Returns:
+            tuple: (prev_bits, prev_score, changed) - pass the first two to undo()
+        """
+        prev_bits = self._bits
+        prev_score = self._score
+        new_bits, score_gained = _MOVE_FNS[move](prev_bits)
+
+        if new_bits == prev_bits:
+            return prev_bits, prev_score, False
+
+        self._bits = new_bits
+        self._score += score_gained
+        return prev_bits, prev_score, True
+
+    def undo(self, prev_bits, prev_score):
+        """Take back a move made with move_undoable()."""
+        self._bits = prev_bits
+        self._score = prev_score
+
     def update_highscore(self):
         """Save the current high score to file."""
-        with open(r"./game/highscore.txt", "w", encoding="utf-8") as f:
+        global _HIGHSCORE  # pylint: disable=global-statement
+        _HIGHSCORE = self._highscore
+        with open(HIGHSCORE_PATH, "w", encoding="utf-8") as f:
             f.write(str(self._highscore))
     def check_game_over(self):
         """
@@ -159,13 +475,9 @@ class Board:
         Returns:
             bool: True if no moves possible, False otherwise
         """
-        # try every direction to see if any move works
-        temp_board = copy.deepcopy(self)
-        directions = ["up", "down", "right", "left"]
-
-        for direction in directions:
-            if temp_board.move(direction):
-                return False  # found a valid move - game's not over
+        # an empty cell or a pair of equal neighbours means a move works
+        if self.can_move():
+            return False
 
         # no moves left, save the high score
         self.update_highscore()
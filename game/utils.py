@@ -1,11 +1,15 @@
 """Utility functions and constants for 2048."""
+from functools import lru_cache
 import numpy as np
-import pygame as pg
 
 # ==================== SCREEN CONSTANTS ====================
 # Auto-detect screen size and scale accordingly
+@lru_cache(maxsize=None)
 def get_screen_dimensions():
     """Get appropriate screen dimensions based on display size."""
+    # only the screen size needs pygame, so the game logic and tests can
+    # import this module without starting it up
+    import pygame as pg  # pylint: disable=import-outside-toplevel
     pg.init()
     display_info = pg.display.Info()
     screen_w = display_info.current_w
@@ -17,7 +21,15 @@ def get_screen_dimensions():
     
     return height, width
 
-SCREEN_HEIGHT, SCREEN_WIDTH = get_screen_dimensions()
+def __getattr__(name):
+    """Work out SCREEN_HEIGHT and SCREEN_WIDTH the first time they're used."""
+    if name in ('SCREEN_HEIGHT', 'SCREEN_WIDTH'):
+        # store them as plain globals so later lookups skip this
+        height, width = get_screen_dimensions()
+        globals().update(SCREEN_HEIGHT=height, SCREEN_WIDTH=width)
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 TILE_GAP = 10
 
 # ================== COLOR CONSTANTS =================
@@ -93,8 +105,11 @@ def combine_line(line):
             new_line_list.append(non_zero[i])
             i += 1
 
-    new_line_padded = np.zeros_like(line, dtype=int)
-    new_line_padded[:len(new_line_list)] = new_line_list
+    # only the slots past the merged tiles need zeroing
+    new_line_padded = np.empty_like(line, dtype=int)
+    k = len(new_line_list)
+    new_line_padded[:k] = new_line_list
+    new_line_padded[k:] = 0
 
     return new_line_padded, score_gained
 
@@ -127,8 +142,9 @@ def get_grid_dimensions(size):
     Returns:
         tuple: (tile_size, start_x, start_y, grid_width, grid_height)
     """
-    available_height = int(SCREEN_HEIGHT * 2/3)
-    available_width = SCREEN_WIDTH
+    screen_height, screen_width = get_screen_dimensions()
+    available_height = int(screen_height * 2/3)
+    available_width = screen_width
 
     max_grid_size = min(available_width, available_height) * 0.9
 
@@ -137,8 +153,8 @@ def get_grid_dimensions(size):
     grid_width = size * tile_size + (size + 1) * TILE_GAP
     grid_height = size * tile_size + (size + 1) * TILE_GAP
 
-    start_x = (SCREEN_WIDTH - grid_width) / 2
-    start_y = SCREEN_HEIGHT / 3 + (available_height - grid_height) / 2 - 50
+    start_x = (screen_width - grid_width) / 2
+    start_y = screen_height / 3 + (available_height - grid_height) / 2 - 50
 
     return tile_size, start_x, start_y, grid_width, grid_height
 
@@ -19,6 +19,9 @@ def main():
     while play_again:
         play_again = run_game()
 
+    # the menu leaves pygame running when they close it
+    pg.quit()
+
 
 def run_game():
     """
@@ -23,18 +23,32 @@ class TileAnimation:
         self.type = animation_type
         self.duration = duration
         self.start_time = pg.time.get_ticks()
+        self.progress = 0.0
+
+    def update(self, now_ticks):
+        """
+        Calculate animation progress for the current frame.
+
+        Called once per frame so the rect, scale and finished checks
+        all share one clock reading.
+
+        Args:
+            now_ticks: pg.time.get_ticks() for this frame
+        """
+        elapsed = now_ticks - self.start_time
+        self.progress = min(elapsed / self.duration, 1.0)
 
     def get_progress(self):
         """
-        Calculate animation progress from 0.0 to 1.0.
+        Get animation progress as of the last update().
         
         Returns:
             float: Progress value clamped between 0.0 and 1.0
         """
-        elapsed = pg.time.get_ticks() - self.start_time
-        return min(elapsed / self.duration, 1.0)
+        return self.progress
 
-    def ease_out_cubic(self, t):
+    @staticmethod
+    def ease_out_cubic(t):
         """
         Easing function for smooth animation.
         
@@ -44,7 +58,8 @@ class TileAnimation:
         Returns:
             float: Eased value
         """
-        return 1 - pow(1 - t, 3)
+        x = 1 - t
+        return 1 - x * x * x
 
     def get_current_rect(self):
         """
@@ -5,6 +5,17 @@ import pygame as pg
 import game.utils as ut
 # pylint: disable=E1101
 
+# the screen size never changes, so work out the layout numbers once
+_W = ut.SCREEN_WIDTH
+_H = ut.SCREEN_HEIGHT
+_CX = _H // 2
+_TITLE_RECT_CENTER = (_CX, 100)
+_SUBTITLE_CENTER = (_CX, 160)
+_FOOTER_CENTER = (_CX, _W - 40)
+
+# font files found on this system, filled in the first time the menu opens
+_FONT_PATHS = {}
+
 def show_difficulty_menu():
     """
     Display difficulty selection menu.
@@ -16,10 +27,25 @@ def show_difficulty_menu():
     if 'SDL_VIDEO_CENTERED' not in os.environ:
         os.environ['SDL_VIDEO_CENTERED'] = '1'
 
-    pg.init()
-    screen = pg.display.set_mode((ut.SCREEN_HEIGHT, ut.SCREEN_WIDTH))
+    # the game may have set everything up already, e.g. when they play again
+    if not pg.display.get_init():
+        pg.init()
+
+    # reuse the window if it's already the right size. nothing animates in
+    # the menu and we only repaint on hover changes, so there's no point
+    # waiting on the monitor's refresh
+    screen = pg.display.get_surface()
+    if screen is None or screen.get_size() != (_H, _W):
+        screen = pg.display.set_mode((_H, _W), vsync=0)
     pg.display.set_caption("2048 - Select Difficulty")
 
+    # we only care about clicks, hovering, the window needing a repaint or
+    # the mouse leaving it, and closing it, so have SDL drop everything
+    # else before it ever reaches python
+    pg.event.set_blocked(None)
+    pg.event.set_allowed([pg.QUIT, pg.MOUSEBUTTONDOWN, pg.MOUSEMOTION,
+                          pg.WINDOWEXPOSED, pg.WINDOWLEAVE])
+
     fonts = _initialize_fonts()
 
     # set up the difficulty options
@@ -28,12 +54,49 @@ def show_difficulty_menu():
     # figure out where the buttons should go
     button_rects = _create_button_layout(options)
 
+    # none of the text ever changes, so render it all once up front
+    cached = _render_static_text(fonts, options, button_rects)
+
     # run the menu until they pick something
-    selected = _menu_loop(screen, fonts, options, button_rects)
+    selected = _menu_loop(screen, cached, button_rects)
 
     return selected
 
 
+def _font_paths():
+    """
+    Find the menu's font files, only searching the system fonts the first time.
+
+    Returns:
+        dict: Font file path for 'comic' and 'arial' (None means pygame's
+            default font)
+    """
+    if not _FONT_PATHS:
+        arial = pg.font.match_font("arial")
+        _FONT_PATHS['arial'] = arial
+        _FONT_PATHS['comic'] = pg.font.match_font("comicsansms") or arial
+    return _FONT_PATHS
+
+
+def _make_font(path, size, bold=False, italic=False):
+    """
+    Load a font file at a given size.
+
+    Args:
+        path: Font file path from _font_paths
+        size: Font size
+        bold: Whether to make it bold
+        italic: Whether to make it italic
+
+    Returns:
+        pygame.font.Font: The font
+    """
+    font = pg.font.Font(path, size)
+    font.set_bold(bold)
+    font.set_italic(italic)
+    return font
+
+
 def _initialize_fonts():
     """
     Initialize all fonts used in the menu.
@@ -41,13 +104,14 @@ def _initialize_fonts():
     Returns:
         dict: Dictionary of font objects
     """
+    paths = _font_paths()
     return {
-        'title': pg.font.SysFont("Comic Sans MS", 60, bold=True),
-        'subtitle': pg.font.SysFont("Arial", 20),
-        'option': pg.font.SysFont("Arial", 32, bold=True),
-        'desc': pg.font.SysFont("Arial", 16),
-        'detail': pg.font.SysFont("Arial", 14),
-        'footer': pg.font.SysFont("Arial", 14, italic=True)
+        'title': _make_font(paths['comic'], 60, bold=True),
+        'subtitle': _make_font(paths['arial'], 20),
+        'option': _make_font(paths['arial'], 32, bold=True),
+        'desc': _make_font(paths['arial'], 16),
+        'detail': _make_font(paths['arial'], 14),
+        'footer': _make_font(paths['arial'], 14, italic=True)
     }
 
 
@@ -76,188 +140,315 @@ def _create_button_layout(options):
         options: List of menu options
         
     Returns:
-        list: List of tuples (rect, difficulty_name, color)
+        list: List of tuples (rect, difficulty_name, color, hover_color,
+            shadow_rect)
     """
     button_width = 450
     button_height = 75
     button_spacing = 100
     start_y = 250
-    center_x = ut.SCREEN_HEIGHT // 2
 
     button_rects = []
     for i, (name, _, _, color) in enumerate(options):
         rect = pg.Rect(
-            center_x - button_width // 2,
+            _CX - button_width // 2,
             start_y + i * button_spacing,
             button_width,
             button_height
         )
-        button_rects.append((rect, name.lower(), color))
+        # brighten the color a bit for when they're hovering
+        hover_color = tuple(min(c + 30, 255) for c in color)
+        button_rects.append((rect, name.lower(), color, hover_color, rect.move(2, 2)))
 
     return button_rects
 
 
-def _menu_loop(screen, fonts, options, button_rects):
+def _render_text(font, text, color, **position):
+    """
+    Render a piece of text and place its rect.
+
+    Args:
+        font: Font to render with
+        text: Text to render
+        color: Text color
+        **position: Rect attributes to place it with, e.g. center=(x, y)
+
+    Returns:
+        tuple: (surface, rect)
+    """
+    surface = font.render(text, True, color)
+    return surface, surface.get_rect(**position)
+
+
+def _render_static_text(fonts, options, button_rects):
+    """
+    Render every piece of menu text and the buttons once.
+
+    Args:
+        fonts: Dictionary of font objects
+        options: List of menu options
+        button_rects: List of button rectangles
+
+    Returns:
+        dict: (surface, rect) pairs for 'title', 'subtitle' and 'footer',
+            'buttons' with a dict of 'name', 'desc' and 'detail' pairs per
+            button, 'button_surfs' with a (normal, hover, area) tuple per
+            button from _render_button, and 'blits' with the (surface, rect)
+            pairs of the text outside the buttons
+    """
+    cached = {
+        'title': _render_text(fonts['title'], "2048", (119, 110, 101),
+                              center=_TITLE_RECT_CENTER),
+        'subtitle': _render_text(fonts['subtitle'], "Choose Your Challenge",
+                                 (119, 110, 101), center=_SUBTITLE_CENTER),
+        'footer': _render_text(fonts['footer'], "Click a difficulty to start playing",
+                               (150, 150, 150), center=_FOOTER_CENTER),
+        'buttons': []
+    }
+
+    for (rect, *_), (name, desc, detail, _) in zip(button_rects, options):
+        cached['buttons'].append({
+            # the difficulty name with the description below it
+            'name': _render_text(fonts['option'], name, (255, 255, 255),
+                                 center=(rect.centerx, rect.centery - 15)),
+            'desc': _render_text(fonts['desc'], desc, (255, 255, 255),
+                                 center=(rect.centerx, rect.centery + 15)),
+            # and the detail text under the button
+            'detail': _render_text(fonts['detail'], detail, (119, 110, 101),
+                                   center=(_CX, rect.bottom + 12))
+        })
+
+    # the buttons never change either, so draw each one with its text
+    # once plain and once hovered, and just blit the right one later
+    cached['button_surfs'] = [
+        _render_button(rect, color, hover_color, shadow_rect, texts)
+        for (rect, _, color, hover_color, shadow_rect), texts
+        in zip(button_rects, cached['buttons'])
+    ]
+
+    # the rest of the text, so it can all go in one call
+    cached['blits'] = [cached['title'], cached['subtitle'], cached['footer']]
+    cached['blits'].extend(texts['detail'] for texts in cached['buttons'])
+
+    return cached
+
+
+def _render_button(rect, color, hover_color, shadow_rect, texts):
+    """
+    Draw a button and its text onto surfaces of its own.
+
+    Args:
+        rect: Button rectangle
+        color: Button color
+        hover_color: Brighter button color for hovering
+        shadow_rect: Where the hover shadow goes
+        texts: The button's pre-rendered 'name' and 'desc'
+
+    Returns:
+        tuple: (normal_surface, hover_surface, area) where area is the
+            part of the screen both surfaces cover, shadow included
+    """
+    area = rect.union(shadow_rect)
+
+    # everything gets drawn relative to the corner of the area
+    local_rect = rect.move(-area.x, -area.y)
+    local_shadow = shadow_rect.move(-area.x, -area.y)
+    text_blits = [(surface, text_rect.move(-area.x, -area.y))
+                  for surface, text_rect in (texts['name'], texts['desc'])]
+
+    surfaces = []
+    for is_hover in (False, True):
+        # no per-pixel alpha, the background is baked in
+        surface = pg.Surface(area.size).convert()
+        surface.fill(ut.BACKGROUND_COLOR)
+        _draw_button(surface, local_rect, (color, hover_color, local_shadow), is_hover)
+        _blit_all(surface, text_blits)
+        surfaces.append(surface)
+
+    return surfaces[0], surfaces[1], area
+
+
+def _menu_loop(screen, cached, button_rects):
     """
     Main menu loop for difficulty selection.
     
     Args:
         screen: Pygame display surface
-        fonts: Dictionary of font objects
-        options: List of menu options
+        cached: Pre-rendered menu from _render_static_text
         button_rects: List of button rectangles
         
     Returns:
         str or None: Selected difficulty or None
     """
     selected = None
-    clock = pg.time.Clock()
 
-    while selected is None:
-        screen.fill(ut.BACKGROUND_COLOR)
-
-        # draw everything on screen
-        _draw_title(screen, fonts)
-        _draw_buttons(screen, fonts, options, button_rects)
-        _draw_footer(screen, fonts)
+    # draw the whole menu once, after that only hover changes need painting
+    hover_idx = _find_hover(button_rects, pg.mouse.get_pos())
+    _draw_menu(screen, cached, hover_idx)
+    pg.display.update()
 
-        for event in pg.event.get():
-            if event.type == pg.QUIT:
-                pg.quit()
-                return None
+    while selected is None:
+        # sleep until something happens instead of spinning at 60fps
+        event = pg.event.wait(timeout=50)
+
+        if event.type == pg.NOEVENT:
+            continue
+
+        if event.type == pg.QUIT:
+            # leave shutting pygame down to whoever opened the menu
+            pg.event.set_allowed(None)
+            return None
+
+        if event.type == pg.MOUSEBUTTONDOWN:
+            selected = _check_button_click(event.pos, button_rects, hover_idx)
+        elif event.type == pg.MOUSEMOTION:
+            hover_idx = _change_hover(screen, cached, hover_idx,
+                                      _find_hover(button_rects, event.pos))
+        elif event.type == pg.WINDOWLEAVE:
+            # the mouse left the window, so nothing's hovered anymore
+            hover_idx = _change_hover(screen, cached, hover_idx, -1)
+        elif event.type == pg.WINDOWEXPOSED:
+            # the window got covered or minimised and lost what we drew
+            _draw_menu(screen, cached, hover_idx)
+            pg.display.update()
+
+    # let the game see every event again
+    pg.event.set_allowed(None)
 
-            if event.type == pg.MOUSEBUTTONDOWN:
-                selected = _check_button_click(event.pos, button_rects)
+    return selected
 
-        pg.display.update()
-        clock.tick(60)
 
-    return selected
+def _change_hover(screen, cached, hover_idx, new_hover):
+    """
+    Move the hover highlight from one button to another.
 
+    Args:
+        screen: Pygame display surface
+        cached: Pre-rendered menu from _render_static_text
+        hover_idx: Index of the currently hovered button, or -1
+        new_hover: Index of the button to hover now, or -1
 
-def _draw_title(screen, fonts):
-    """Draw menu title and subtitle."""
-    title = fonts['title'].render("2048", True, (119, 110, 101))
-    title_rect = title.get_rect(center=(ut.SCREEN_HEIGHT // 2, 100))
-    screen.blit(title, title_rect)
+    Returns:
+        int: The new hover index
+    """
+    if new_hover != hover_idx:
+        # only the button we left and the one we entered need repainting
+        dirty = [
+            _redraw_button(screen, cached, i, i == new_hover)
+            for i in (hover_idx, new_hover) if i >= 0
+        ]
+        pg.display.update(dirty)
 
-    subtitle = fonts['subtitle'].render("Choose Your Challenge", True, (119, 110, 101))
-    subtitle_rect = subtitle.get_rect(center=(ut.SCREEN_HEIGHT // 2, 160))
-    screen.blit(subtitle, subtitle_rect)
+    return new_hover
 
 
-def _draw_buttons(screen, fonts, options, button_rects):
+def _find_hover(button_rects, mouse_pos):
     """
-    Draw all difficulty selection buttons.
-    
+    Find which button the mouse is over.
+
     Args:
-        screen: Pygame display surface
-        fonts: Dictionary of font objects
-        options: List of menu options
         button_rects: List of button rectangles
+        mouse_pos: Mouse position tuple (x, y)
+
+    Returns:
+        int: Index of the button, or -1 if it's not over any
     """
-    mouse_pos = pg.mouse.get_pos()
+    return next((i for i, (rect, *_) in enumerate(button_rects)
+                 if rect.collidepoint(mouse_pos)), -1)
 
-    for (rect, _, color), (name, desc, detail, _) in zip(button_rects, options):
-        is_hover = rect.collidepoint(mouse_pos)
 
-        # draw the button with a hover effect if theyre pointing at it
-        _draw_button(screen, rect, color, is_hover)
+def _draw_menu(screen, cached, hover_idx):
+    """
+    Draw the whole menu.
 
-        # add the text on the button
-        _draw_button_text(screen, fonts, rect, name, desc)
+    Args:
+        screen: Pygame display surface
+        cached: Pre-rendered menu from _render_static_text
+        hover_idx: Index of the hovered button, or -1
+    """
+    screen.fill(ut.BACKGROUND_COLOR)
 
-        # put the detail text below
-        _draw_button_detail(screen, fonts, rect, detail)
+    # the pre-drawn buttons and all the other text in one go
+    buttons = [(hover if i == hover_idx else normal, area)
+               for i, (normal, hover, area) in enumerate(cached['button_surfs'])]
+    _blit_all(screen, buttons + cached['blits'])
 
 
-def _draw_button(screen, rect, color, is_hover):
+def _redraw_button(screen, cached, index, is_hover):
     """
-    Draw a single button with optional hover effect.
-    
+    Repaint one button and its text without touching the rest of the menu.
+
     Args:
         screen: Pygame display surface
-        rect: Button rectangle
-        color: Button color
-        is_hover: Whether mouse is hovering over button
+        cached: Pre-rendered menu from _render_static_text
+        index: Which button to repaint
+        is_hover: Whether mouse is hovering over it
+
+    Returns:
+        pygame.Rect: The area that was repainted
     """
-    # brighten the color a bit if they're hovering
-    btn_color = tuple(min(c + 30, 255) for c in color) if is_hover else color
+    normal, hover, area = cached['button_surfs'][index]
 
-    # add a subtle shadow when hovering to make it pop
-    if is_hover:
-        shadow_rect = rect.copy()
-        shadow_rect.x += 2
-        shadow_rect.y += 2
-        pg.draw.rect(screen, (150, 150, 150), shadow_rect, border_radius=10)
+    # the surface covers the shadow and background too, so no clearing
+    screen.blit(hover if is_hover else normal, area)
 
-    pg.draw.rect(screen, btn_color, rect, border_radius=10)
+    return area
 
 
-def _draw_button_text(screen, fonts, rect, name, description):
+def _blit_all(screen, blits):
     """
-    Draw text on a button.
-    
+    Blit a list of (surface, rect) pairs in a single call.
+
     Args:
         screen: Pygame display surface
-        fonts: Dictionary of font objects
-        rect: Button rectangle
-        name: Button name text
-        description: Button description text
+        blits: List of (surface, rect) pairs
     """
-    # draw the difficulty name
-    text = fonts['option'].render(name, True, (255, 255, 255))
-    text_rect = text.get_rect(center=(rect.centerx, rect.centery - 15))
-    screen.blit(text, text_rect)
+    # fblits skips building a list of result rects, but only pygame-ce has it
+    if hasattr(screen, 'fblits'):
+        screen.fblits(blits)
+    else:
+        screen.blits(blits, doreturn=False)
 
-    # add the description below it
-    desc_text = fonts['desc'].render(description, True, (255, 255, 255))
-    desc_rect = desc_text.get_rect(center=(rect.centerx, rect.centery + 15))
-    screen.blit(desc_text, desc_rect)
 
-
-def _draw_button_detail(screen, fonts, rect, detail):
+def _draw_button(screen, rect, style, is_hover):
     """
-    Draw detail text below a button.
+    Draw a single button with optional hover effect.
     
     Args:
         screen: Pygame display surface
-        fonts: Dictionary of font objects
         rect: Button rectangle
-        detail: Detail text to display
+        style: Tuple (color, hover_color, shadow_rect) for the button
+        is_hover: Whether mouse is hovering over button
     """
-    detail_text = fonts['detail'].render(detail, True, (119, 110, 101))
-    detail_rect = detail_text.get_rect(
-        center=(ut.SCREEN_HEIGHT // 2, rect.bottom + 12)
-    )
-    screen.blit(detail_text, detail_rect)
+    color, hover_color, shadow_rect = style
+    btn_color = hover_color if is_hover else color
 
+    # add a subtle shadow when hovering to make it pop
+    if is_hover:
+        pg.draw.rect(screen, (150, 150, 150), shadow_rect, border_radius=10)
 
-def _draw_footer(screen, fonts):
-    """Draw footer instruction text."""
-    footer = fonts['footer'].render(
-        "Click a difficulty to start playing",
-        True,
-        (150, 150, 150)
-    )
-    footer_rect = footer.get_rect(
-        center=(ut.SCREEN_HEIGHT // 2, ut.SCREEN_WIDTH - 40)
-    )
-    screen.blit(footer, footer_rect)
+    pg.draw.rect(screen, btn_color, rect, border_radius=10)
 
 
-def _check_button_click(mouse_pos, button_rects):
+def _check_button_click(mouse_pos, button_rects, hover_idx=-1):
     """
     Check if a button was clicked.
     
     Args:
         mouse_pos: Mouse position tuple (x, y)
         button_rects: List of button rectangles
+        hover_idx: Index of the hovered button, or -1
         
     Returns:
         str or None: Difficulty name if clicked, None otherwise
     """
-    for rect, difficulty, _ in button_rects:
+    # they almost always click the button they're hovering over
+    if hover_idx >= 0:
+        rect, difficulty, *_ = button_rects[hover_idx]
+        if rect.collidepoint(mouse_pos):
+            return difficulty
+
+    for rect, difficulty, *_ in button_rects:
         if rect.collidepoint(mouse_pos):
             return difficulty
     return None
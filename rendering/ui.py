@@ -231,6 +231,11 @@ class GameUI:  # pylint: disable=too-many-instance-attributes
         # draw the background panel behind the tiles
         pg.draw.rect(self.screen, ut.GRID_BACKGROUND_COLOR, self.grid_bg_rect, border_radius=8)
 
+        # read the clock once and move every animation along to it
+        now = pg.time.get_ticks()
+        for anim in self.animations:
+            anim.update(now)
+
         self.draw_tiles()
         self.update_animations()
 
@@ -0,0 +1,9 @@
+"""Shared pytest setup for 2048 tests."""
+import os
+
+# never open a real window or sound device while testing. these have to be
+# set before anything imports pygame
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+# same as the game and menu use
+os.environ.setdefault("SDL_VIDEO_CENTERED", "1")
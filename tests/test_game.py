@@ -7,55 +7,55 @@ import numpy as np
 # add the parent directory to path so imports work from tests/ folder
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from game.board import Board
+from game.board import Board, MOVE_LEFT, ROW_LEFT_TABLE, ROW_SCORE_TABLE
 from game.utils import combine_line
-from ai.spawner import AISpawner
+from ai.spawner import AISpawner, SCORE_WEIGHT
+
+
+# grids shared by several tests. the board packs whatever it's given,
+# so they're never modified and can be built once up front
+
+# no empty cells and no neighbours match, so nothing can move
+CHECKER = np.array([
+    [2, 4, 2, 4],
+    [4, 2, 4, 2],
+    [2, 4, 2, 4],
+    [4, 2, 4, 2]
+])
+
+# one pair in the top left corner, ready to merge
+PAIR = np.array([
+    [2, 2, 0, 0],
+    [0, 0, 0, 0],
+    [0, 0, 0, 0],
+    [0, 0, 0, 0]
+])
+
+# an increasing top row with the rest of the board open for spawns
+TOP_ROW = np.array([
+    [2, 4, 8, 16],
+    [0, 0, 0, 0],
+    [0, 0, 0, 0],
+    [0, 0, 0, 0]
+])
 
 
 class TestCombineLine:
     """Test the core tile merging logic."""
 
-    def test_merge_two_tiles(self):
-        """Test merging two identical tiles."""
-        line = np.array([2, 2, 0, 0])
-        result, score = combine_line(line)
-        assert np.array_equal(result, np.array([4, 0, 0, 0]))
-        assert score == 4
-
-    def test_merge_multiple_pairs(self):
-        """Test merging multiple pairs in one line."""
-        line = np.array([2, 2, 4, 4])
-        result, score = combine_line(line)
-        assert np.array_equal(result, np.array([4, 8, 0, 0]))
-        assert score == 12
-
-    def test_no_merge_different_values(self):
-        """Test that different values don't merge."""
-        line = np.array([2, 4, 8, 0])
-        result, score = combine_line(line)
-        assert np.array_equal(result, np.array([2, 4, 8, 0]))
-        assert score == 0
-
-    def test_compress_with_gaps(self):
-        """Test compression removes gaps."""
-        line = np.array([2, 0, 2, 0])
-        result, score = combine_line(line)
-        assert np.array_equal(result, np.array([4, 0, 0, 0]))
-        assert score == 4
-
-    def test_empty_line(self):
-        """Test empty line returns zeros."""
-        line = np.array([0, 0, 0, 0])
-        result, score = combine_line(line)
-        assert np.array_equal(result, np.array([0, 0, 0, 0]))
-        assert score == 0
-
-    def test_triple_same_value(self):
-        """Test three identical tiles only merge first two."""
-        line = np.array([2, 2, 2, 0])
-        result, score = combine_line(line)
-        assert np.array_equal(result, np.array([4, 2, 0, 0]))
-        assert score == 4
+    @pytest.mark.parametrize("line,expected,score", [
+        ([2, 2, 0, 0], [4, 0, 0, 0], 4),    # two identical tiles merge
+        ([2, 2, 4, 4], [4, 8, 0, 0], 12),   # multiple pairs merge in one line
+        ([2, 4, 8, 0], [2, 4, 8, 0], 0),    # different values don't merge
+        ([2, 0, 2, 0], [4, 0, 0, 0], 4),    # compression removes gaps
+        ([0, 0, 0, 0], [0, 0, 0, 0], 0),    # empty line stays empty
+        ([2, 2, 2, 0], [4, 2, 0, 0], 4),    # three in a row only merge the first two
+    ])
+    def test_combine_line(self, line, expected, score):
+        """Test a line slides and merges correctly."""
+        result, gained = combine_line(np.array(line))
+        assert np.array_equal(result, np.array(expected))
+        assert gained == score
 
 
 class TestBoard:
@@ -96,15 +96,70 @@ class TestBoard:
     def test_move_creates_merge(self):
         """Test move that creates a merge."""
         board = Board(4, spawn_initial=False)
+        board._grid = PAIR
+        board.move('left')
+        assert board.grid[0, 0] == 4
+        assert board.score == 4
+
+    def test_move_down_merges_columns(self):
+        """Test vertical moves slide and merge along columns."""
+        board = Board(4, spawn_initial=False)
         board._grid = np.array([
-            [2, 2, 0, 0],
+            [2, 0, 0, 8],
+            [2, 0, 4, 0],
+            [4, 0, 0, 8],
+            [0, 0, 0, 0]
+        ])
+        assert board.move('down')
+        assert np.array_equal(board.grid, np.array([
             [0, 0, 0, 0],
             [0, 0, 0, 0],
+            [4, 0, 0, 0],
+            [4, 0, 4, 16]
+        ]))
+        assert board.score == 20
+
+    def test_undo_restores_board(self):
+        """Test an undoable move can be taken back exactly."""
+        board = Board(4, spawn_initial=False)
+        board._grid = np.array([
+            [2, 2, 0, 0],
+            [0, 4, 0, 4],
+            [0, 0, 0, 0],
             [0, 0, 0, 0]
         ])
-        board.move('left')
-        assert board.grid[0, 0] == 4
-        assert board.score == 4
+        before = board.grid.copy()
+        prev_bits, prev_score, changed = board.move_undoable(MOVE_LEFT)
+        assert changed
+        assert board.score == 12
+        board.undo(prev_bits, prev_score)
+        assert np.array_equal(board.grid, before)
+        assert board.score == 0
+
+    def test_empty_cells(self):
+        """Test empty cells are listed in reading order."""
+        board = Board(4, spawn_initial=False)
+        board._grid = np.array([
+            [2, 0, 4, 8],
+            [4, 8, 16, 32],
+            [0, 2, 4, 8],
+            [8, 4, 2, 0]
+        ])
+        assert board.empty_cells() == ((0, 1), (2, 0), (3, 3))
+
+    def test_row_tables_match_combine_line(self):
+        """Test the precomputed bitboard rows agree with combine_line."""
+        # exponent 15 is left out since the bitboard caps merges there
+        for row in range(65536):
+            exponents = [(row >> shift) & 0xF for shift in (0, 4, 8, 12)]
+            if 15 in exponents:
+                continue
+            line = np.array([1 << e if e else 0 for e in exponents])
+            expected, score = combine_line(line)
+            packed = ROW_LEFT_TABLE[row]
+            result = [(packed >> shift) & 0xF for shift in (0, 4, 8, 12)]
+            assert [1 << e if e else 0 for e in result] == list(expected)
+            assert ROW_SCORE_TABLE[row] == score
 
     def test_invalid_move(self):
         """Test invalid move direction."""
@@ -125,6 +180,17 @@ class TestBoard:
         assert board.won
         assert board.high_tile == 2048
 
+    def test_clone_is_independent(self):
+        """Test that moving a clone leaves the original alone."""
+        board = Board(4, spawn_initial=False)
+        board._grid = PAIR
+        clone = board.clone()
+        clone.move('left')
+        assert board.grid[0, 0] == 2
+        assert board.score == 0
+        assert clone.grid[0, 0] == 4
+        assert clone.ai_spawner is board.ai_spawner
+
 
 class TestAISpawner:
     """Test the AI spawner logic."""
@@ -141,12 +207,7 @@ class TestAISpawner:
         """Test easy difficulty picks favorable positions."""
         board = Board(4, difficulty='easy', spawn_initial=False)
         # set up a board where one corner is clearly better
-        board._grid = np.array([
-            [2, 4, 8, 16],
-            [0, 0, 0, 0],
-            [0, 0, 0, 0],
-            [0, 0, 0, 0]
-        ])
+        board._grid = TOP_ROW
         spawner = AISpawner(difficulty='easy', search_depth=2)
         spawner.spawn_tile(board)
         # should spawn somewhere that helps (not blocking the high tiles)
@@ -155,16 +216,83 @@ class TestAISpawner:
     def test_hard_hinders_player(self):
         """Test hard difficulty picks bad positions."""
         board = Board(4, difficulty='hard', spawn_initial=False)
+        board._grid = TOP_ROW
+        spawner = AISpawner(difficulty='hard', search_depth=3)
+        spawner.spawn_tile(board)
+        # should spawn somewhere that hinders
+        assert np.count_nonzero(board.grid) == 5
+
+    def test_spawns_even_without_time_budget(self):
+        """Test the shallowest search still finishes when time runs out."""
+        board = Board(4, difficulty='hard', spawn_initial=False)
+        board._grid = TOP_ROW
+        spawner = AISpawner(difficulty='hard', time_limit=0.0)
+        cells = board.empty_cells()
+        scores = spawner._score_spawns(board, cells)
+
+        # only the depth 1 pass should have finished
+        fresh = AISpawner(difficulty='hard')
+        expected = [0.9 * fresh._evaluate_spawn(board, row, col, 2, 1) +
+                    0.1 * fresh._evaluate_spawn(board, row, col, 4, 1)
+                    for row, col in cells]
+        assert scores.tolist() == pytest.approx(expected)
+        assert all(depth <= 1 for _, depth in spawner._tt.values())
+
+        assert spawner.spawn_tile(board) is True
+        assert np.count_nonzero(board.grid) == 5
+
+    def test_transposition_table_keeps_values_exact(self):
+        """Test a cached position reached with a different score stays exact."""
+        board = Board(4, difficulty='easy', spawn_initial=False)
         board._grid = np.array([
             [2, 4, 8, 16],
+            [4, 8, 16, 2],
+            [0, 2, 4, 0],
+            [0, 0, 2, 0]
+        ])
+        warm = AISpawner(difficulty='easy', search_depth=2)
+        first = warm._evaluate_spawn(board, 2, 0, 2)
+
+        # count lookups that find something, to be sure the cache gets used
+        hits = []
+
+        class CountingTable(dict):
+            """Transposition table that records its hits."""
+            def get(self, key, default=None):
+                entry = super().get(key, default)
+                if entry is not None:
+                    hits.append(key)
+                return entry
+
+        warm._tt = CountingTable(warm._tt)
+
+        # same tiles, different score - the search has to come from the table
+        board._score = 100
+        second = warm._evaluate_spawn(board, 2, 0, 2)
+        assert hits
+        assert second == first + SCORE_WEIGHT * 100
+
+        cold = AISpawner(difficulty='easy', search_depth=2)
+        assert second == pytest.approx(cold._evaluate_spawn(board, 2, 0, 2))
+
+    def test_evaluation_prefers_max_tile_in_corner(self):
+        """Test the heuristic rewards keeping the big tile in a corner."""
+        spawner = AISpawner(difficulty='easy')
+        cornered = Board(4, spawn_initial=False)
+        cornered._grid = np.array([
+            [256, 4, 0, 0],
             [0, 0, 0, 0],
             [0, 0, 0, 0],
             [0, 0, 0, 0]
         ])
-        spawner = AISpawner(difficulty='hard', search_depth=3)
-        spawner.spawn_tile(board)
-        # should spawn somewhere that hinders
-        assert np.count_nonzero(board.grid) == 5
+        middle = Board(4, spawn_initial=False)
+        middle._grid = np.array([
+            [4, 0, 0, 0],
+            [0, 256, 0, 0],
+            [0, 0, 0, 0],
+            [0, 0, 0, 0]
+        ])
+        assert spawner._evaluate_board(cornered) > spawner._evaluate_board(middle)
 
     def test_spawner_returns_false_when_full(self):
         """Test spawner returns False when board is full."""
@@ -182,12 +310,7 @@ class TestGameOver:
         """Test game over detected when no moves possible."""
         board = Board(4, spawn_initial=False)
         # create a checkerboard pattern with no possible merges
-        board._grid = np.array([
-            [2, 4, 2, 4],
-            [4, 2, 4, 2],
-            [2, 4, 2, 4],
-            [4, 2, 4, 2]
-        ])
+        board._grid = CHECKER
         is_over = board.check_game_over()
         assert is_over is True
 